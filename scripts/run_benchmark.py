@@ -1,10 +1,12 @@
 from __future__ import annotations
 
 import argparse
+import difflib
 import os
 import random
 import sys
 from pathlib import Path
+from typing import List
 
 import numpy as np
 import pandas as pd
@@ -12,12 +14,15 @@ import pandas as pd
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 sys.path.append(str(PROJECT_ROOT / "src"))
 
+from orthographic_nli.cache import load_variants, save_variants, variant_cache_key
 from orthographic_nli.config import load_settings
 from orthographic_nli.data import load_local_xnli
 from orthographic_nli.evaluate import evaluate
 from orthographic_nli.groq_client import ModelSpec
+from orthographic_nli.profiling import PhaseProfiler
+from orthographic_nli.sweep import run_sweep, sweep_variants
 from orthographic_nli.traces import log_traces
-from orthographic_nli.variants import build_token_pool, make_variants
+from orthographic_nli.variants import DEFAULT_MIX_RATIOS, DEFAULT_ROMANIZE_RATIOS, build_donor_pools, check_ratios, make_variants
 
 
 def parse_args() -> argparse.Namespace:
@@ -29,7 +34,52 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--max-examples", type=int, help="Max examples per condition")
     parser.add_argument("--requests-per-minute", type=int, help="API rate limit")
     parser.add_argument("--write-traces", action="store_true", help="Write per-example traces")
-    return parser.parse_args()
+    parser.add_argument("--sweep", action="store_true", help="Sweep ratios and seeds instead of a single run")
+    parser.add_argument("--seeds", type=str, help="Sweep seeds, comma-separated or start:stop:step")
+    parser.add_argument("--romanize-ratios", type=str, help="Sweep romanization ratios, comma-separated or start:stop:step")
+    parser.add_argument("--mix-ratios", type=str, help="Sweep code-switching ratios, comma-separated or start:stop:step")
+    parser.add_argument("--cache-dir", type=str, help="Directory for cached variant sets")
+    parser.add_argument("--no-cache", action="store_true", help="Regenerate variants without reading or writing the cache")
+    parser.add_argument("--profile", action="store_true", help="Time each phase and write profile.json")
+    parser.add_argument("--profile-phase", type=str, help="Run cProfile/tracemalloc on one named phase (implies --profile)")
+    parser.add_argument("--profile-memory", action="store_true", help="Record per-phase peak memory with tracemalloc (implies --profile)")
+    args = parser.parse_args()
+
+    grid_flags = {"--seeds": args.seeds, "--romanize-ratios": args.romanize_ratios, "--mix-ratios": args.mix_ratios}
+    if not args.sweep:
+        given = [flag for flag, value in grid_flags.items() if value]
+        if given:
+            parser.error(f"{', '.join(given)} only apply with --sweep")
+        return args
+    if args.write_traces:
+        parser.error("--write-traces is not supported with --sweep")
+    try:
+        if args.seeds:
+            seeds = _parse_grid(args.seeds)
+            if not all(seed.is_integer() for seed in seeds):
+                raise ValueError(f"Seeds must be integers: {args.seeds}")
+            if len(set(seeds)) != len(seeds):
+                raise ValueError(f"Seeds must not repeat: {args.seeds}")
+            args.seeds = [int(seed) for seed in seeds]
+        args.romanize_ratios = check_ratios("R", _parse_grid(args.romanize_ratios) if args.romanize_ratios else DEFAULT_ROMANIZE_RATIOS)
+        args.mix_ratios = check_ratios("M", _parse_grid(args.mix_ratios) if args.mix_ratios else DEFAULT_MIX_RATIOS)
+    except ValueError as exc:
+        parser.error(str(exc))
+    return args
+
+
+def _parse_grid(value: str) -> List[float]:
+    """Parse ``"0.1,0.5,1"`` or an inclusive ``"0:1:0.1"`` range."""
+    if ":" in value:
+        parts = value.split(":")
+        if len(parts) != 3:
+            raise ValueError(f"Expected start:stop:step, got {value!r}")
+        start, stop, step = (float(part) for part in parts)
+        if step <= 0 or stop < start:
+            raise ValueError(f"Range {value!r} needs a positive step and stop >= start")
+        count = int(round((stop - start) / step)) + 1
+        return [round(start + i * step, 10) for i in range(count)]
+    return [float(item) for item in value.split(",") if item.strip()]
 
 
 def main() -> None:
@@ -45,18 +95,63 @@ def main() -> None:
     max_examples = args.max_examples or settings.max_examples_per_condition
     rpm = args.requests_per_minute or settings.requests_per_minute
     write_traces = args.write_traces or settings.write_traces
+    cache_dir = Path(args.cache_dir or settings.variant_cache_dir)
+    use_cache = not args.no_cache
 
     random.seed(settings.rng_seed)
     np.random.seed(settings.rng_seed)
 
-    frames = [load_local_xnli(dataset_dir, lang, eval_split) for lang in languages]
-    base_df = pd.concat(frames, ignore_index=True)
-
-    en_pool = build_token_pool(base_df[base_df.language == "en"].premise.tolist() + base_df[base_df.language == "en"].hypothesis.tolist())
-    ur_pool = build_token_pool(base_df[base_df.language == "ur"].premise.tolist() + base_df[base_df.language == "ur"].hypothesis.tolist())
+    profiler = PhaseProfiler(
+        enabled=args.profile or args.profile_memory or bool(args.profile_phase),
+        detail_phase=args.profile_phase,
+        trace_memory=args.profile_memory,
+    )
 
-    rng = random.Random(settings.rng_seed)
-    variants_df = make_variants(base_df, en_pool, ur_pool, rng)
+    if args.sweep:
+        seeds = args.seeds or [settings.rng_seed]
+        romanize_ratios = args.romanize_ratios
+        mix_ratios = args.mix_ratios
+        if write_traces:
+            print("WRITE_TRACES is ignored in sweep mode")
+    else:
+        seeds = [settings.rng_seed]
+        romanize_ratios = list(DEFAULT_ROMANIZE_RATIOS)
+        mix_ratios = list(DEFAULT_MIX_RATIOS)
+
+    variants_df = None
+    if use_cache:
+        cache_key = variant_cache_key(
+            [dataset_dir / f"{lang}_{eval_split}.csv" for lang in languages],
+            mode="sweep" if args.sweep else "single",
+            languages=languages,
+            split=eval_split,
+            seeds=seeds,
+            romanize_ratios=romanize_ratios,
+            mix_ratios=mix_ratios,
+        )
+        with profiler.phase("cache_load"):
+            variants_df = load_variants(cache_dir, cache_key)
+        if variants_df is not None:
+            print(f"Loaded cached variants {cache_key[:12]} from {cache_dir}")
+
+    if variants_df is None:
+        with profiler.phase("load_data"):
+            frames = [load_local_xnli(dataset_dir, lang, eval_split) for lang in languages]
+            base_df = pd.concat(frames, ignore_index=True)
+        profiler.count("load_data", len(base_df))
+
+        with profiler.phase("token_pools", items=len(base_df)):
+            en_pool, ur_pool = build_donor_pools(base_df)
+
+        with profiler.phase("make_variants", items=len(base_df) * len(seeds)):
+            if args.sweep:
+                variants_df = sweep_variants(base_df, en_pool, ur_pool, seeds, romanize_ratios, mix_ratios)
+            else:
+                rng = random.Random(settings.rng_seed)
+                variants_df = make_variants(base_df, en_pool, ur_pool, rng, romanize_ratios, mix_ratios)
+        if use_cache:
+            with profiler.phase("cache_save", items=len(variants_df)):
+                save_variants(cache_dir, cache_key, variants_df)
 
     # All 5 models from the paper
     specs = [
@@ -67,30 +162,61 @@ def main() -> None:
         ModelSpec(provider="groq", model="gpt-oss-120b-moe"),
     ]
 
-    results_df, predictions_df = evaluate(
-        variants_df,
-        specs,
-        settings.groq_api_keys,
-        rpm,
-        max_examples,
-        settings.rng_seed,
-    )
-
-    results_df.to_csv(results_dir / "benchmark.csv", index=False)
-    predictions_df.to_csv(results_dir / "predictions_samples.csv", index=False)
-
-    if write_traces:
-        log_traces(
-            variants_df,
-            specs,
-            settings.groq_api_keys,
-            rpm,
-            str(results_dir / "traces.jsonl"),
-            settings.rng_seed,
-        )
+    if args.sweep:
+        with profiler.phase("evaluate"):
+            results_df, predictions_df = run_sweep(
+                variants_df,
+                specs,
+                settings.groq_api_keys,
+                rpm,
+                max_examples,
+                settings.rng_seed,
+                profiler,
+            )
+        profiler.count("evaluate", len(predictions_df))
+        with profiler.phase("write_results", items=len(predictions_df)):
+            results_df.to_csv(results_dir / "sweep.csv", index=False)
+            predictions_df.to_csv(results_dir / "sweep_predictions.csv", index=False)
+    else:
+        with profiler.phase("evaluate"):
+            results_df, predictions_df = evaluate(
+                variants_df,
+                specs,
+                settings.groq_api_keys,
+                rpm,
+                max_examples,
+                settings.rng_seed,
+                profiler,
+            )
+        profiler.count("evaluate", len(predictions_df))
+
+        with profiler.phase("write_results", items=len(predictions_df)):
+            results_df.to_csv(results_dir / "benchmark.csv", index=False)
+            predictions_df.to_csv(results_dir / "predictions_samples.csv", index=False)
+
+        if write_traces:
+            with profiler.phase("traces"):
+                log_traces(
+                    variants_df,
+                    specs,
+                    settings.groq_api_keys,
+                    rpm,
+                    str(results_dir / "traces.jsonl"),
+                    settings.rng_seed,
+                    profiler=profiler,
+                )
 
     print(f"Saved results to {results_dir}")
 
+    if profiler.enabled:
+        report_path = profiler.write_report(results_dir)
+        print(profiler.format_table())
+        print(f"Saved profile report to {report_path}")
+        if profiler.missing_detail_phase():
+            close = difflib.get_close_matches(args.profile_phase, list(profiler.phases), n=3)
+            hint = f" Did you mean: {', '.join(close)}?" if close else ""
+            print(f"Warning: --profile-phase {args.profile_phase!r} matched no phase.{hint}")
+
 
 if __name__ == "__main__":
     main()
@@ -10,7 +10,10 @@ Key modules:
     - evaluate: Run model inference and compute metrics
     - groq_client: Interface to Groq API for model inference
     - metrics: Calculate performance deltas
+    - profiling: Per-phase timing, memory and throughput reports
+    - sweep: Evaluate degradation curves over ratio and seed grids
     - config: Configuration management
+    - cache: Content-hashed on-disk cache of generated variant sets
 """
 
 __version__ = "1.0.0"
@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from . import data, sweep, variants
+
+# Bump when the on-disk layout below changes.
+VARIANT_CACHE_VERSION = 2
+
+
+def transform_fingerprint() -> str:
+    """Hash the source of the modules that load, perturb and store the data.
+
+    Any edit to the transforms or to this module's on-disk layout changes the
+    fingerprint, so stale variant sets are never reused.
+    """
+    digest = hashlib.sha256()
+    for path in (data.__file__, variants.__file__, sweep.__file__, __file__):
+        digest.update(Path(path).read_bytes())
+    return digest.hexdigest()
+
+
+def variant_cache_key(source_paths: Sequence[Path], **params) -> str:
+    """Build a cache key from source CSV contents and generation settings.
+
+    Args:
+        source_paths: Dataset CSV files the variants are generated from.
+        **params: JSON-serializable generation settings (seed, languages,
+            split, ratios, ...).
+
+    Returns:
+        Hex digest identifying the variant set.
+
+    Raises:
+        FileNotFoundError: If a source file does not exist.
+    """
+    digest = hashlib.sha256()
+    digest.update(f"v{VARIANT_CACHE_VERSION}".encode())
+    digest.update(transform_fingerprint().encode())
+    digest.update(json.dumps(params, sort_keys=True, default=list).encode())
+    for path in source_paths:
+        if not path.exists():
+            raise FileNotFoundError(f"Expected file not found: {path}")
+        digest.update(hashlib.sha256(path.read_bytes()).digest())
+    return digest.hexdigest()
+
+
+def _save_text(directory: Path, name: str, values: Sequence[str]) -> None:
+    encoded = [value.encode("utf-8") for value in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(value) for value in encoded], out=offsets[1:])
+    np.save(directory / f"{name}.offsets.npy", offsets)
+    np.save(directory / f"{name}.data.npy", np.frombuffer(b"".join(encoded), dtype=np.uint8))
+
+
+def _load_text(directory: Path, name: str) -> np.ndarray:
+    offsets = np.load(directory / f"{name}.offsets.npy", mmap_mode="r").tolist()
+    blob = memoryview(np.load(directory / f"{name}.data.npy", mmap_mode="r"))
+    out = np.empty(len(offsets) - 1, dtype=object)
+    out[:] = [str(blob[start:end], "utf-8") for start, end in zip(offsets[:-1], offsets[1:])]
+    return out
+
+
+def _write_entry(directory: Path, df: pd.DataFrame) -> None:
+    columns: List[Dict] = []
+    for name in df.columns:
+        series = df[name]
+        if series.dtype.kind in "biuf":
+            np.save(directory / f"{name}.npy", series.to_numpy())
+            columns.append({"name": name, "kind": "array"})
+            continue
+        missing = series.isna().to_numpy()
+        if missing.any():
+            np.save(directory / f"{name}.missing.npy", missing)
+        if series.nunique() <= len(series) // 2:
+            codes, categories = pd.factorize(series)
+            np.save(directory / f"{name}.codes.npy", codes.astype(np.int32))
+            columns.append({"name": name, "kind": "category", "categories": categories.tolist()})
+        else:
+            _save_text(directory, name, ["" if flag else str(value) for value, flag in zip(series.tolist(), missing)])
+            columns.append({"name": name, "kind": "text"})
+        columns[-1]["missing"] = bool(missing.any())
+        columns[-1]["dtype"] = str(series.dtype)
+
+    meta = {"version": VARIANT_CACHE_VERSION, "rows": len(df), "columns": columns}
+    with open(directory / "meta.json", "w", encoding="utf-8") as handle:
+        json.dump(meta, handle, ensure_ascii=False)
+
+
+def _read_entry(directory: Path) -> Optional[pd.DataFrame]:
+    """Read an entry, returning None if it is missing, outdated or malformed."""
+    try:
+        return _decode_entry(directory)
+    except (OSError, IndexError, KeyError, TypeError, ValueError):
+        return None
+
+
+def _decode_entry(directory: Path) -> Optional[pd.DataFrame]:
+    meta_path = directory / "meta.json"
+    if not meta_path.exists():
+        return None
+    with open(meta_path, encoding="utf-8") as handle:
+        meta = json.load(handle)
+    if meta.get("version") != VARIANT_CACHE_VERSION:
+        return None
+
+    columns = {}
+    for column in meta["columns"]:
+        name = column["name"]
+        if column["kind"] == "array":
+            columns[name] = np.load(directory / f"{name}.npy", mmap_mode="r")
+            continue
+        if column["kind"] == "category":
+            codes = np.load(directory / f"{name}.codes.npy", mmap_mode="r")
+            # factorize codes missing values as -1, which picks the trailing None.
+            values = np.asarray(column["categories"] + [None], dtype=object)[codes]
+        else:
+            values = _load_text(directory, name)
+        if column.get("missing"):
+            values[np.load(directory / f"{name}.missing.npy")] = None
+        columns[name] = pd.Series(values, dtype=column["dtype"])
+    if any(len(values) != meta["rows"] for values in columns.values()):
+        return None
+    return pd.DataFrame(columns, columns=[column["name"] for column in meta["columns"]])
+
+
+def save_variants(cache_dir: Path, key: str, df: pd.DataFrame) -> Path:
+    """Materialize a variant DataFrame as ``.npy`` files.
+
+    Low-cardinality string columns (language, condition, label) are stored as
+    integer codes, free text as a UTF-8 blob plus offsets, numeric columns
+    as-is, and missing values as a separate mask. The entry is written to a
+    temporary directory, read back and compared with ``df``, then renamed
+    into place so readers never see a partial or lossy entry.
+
+    Args:
+        cache_dir: Root directory of the variant cache.
+        key: Cache key from ``variant_cache_key``.
+        df: Variant DataFrame to store.
+
+    Returns:
+        Path of the cache entry directory.
+
+    Raises:
+        ValueError: If the entry cannot be written or does not round-trip to
+            ``df``.
+    """
+    target = cache_dir / key
+    tmp = cache_dir / f"{key}.tmp-{os.getpid()}"
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir(parents=True)
+
+    try:
+        _write_entry(tmp, df)
+        stored = _read_entry(tmp)
+        if stored is None:
+            raise ValueError("entry could not be read back")
+        pd.testing.assert_frame_equal(stored, df.reset_index(drop=True))
+    except Exception as exc:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise ValueError(f"Variant cache entry {key} does not round-trip: {exc}") from exc
+
+    if target.exists() and not (target / "meta.json").exists():
+        # Left behind by an interrupted or incompatible writer; replace it.
+        shutil.rmtree(target, ignore_errors=True)
+    try:
+        os.replace(tmp, target)
+    except OSError:
+        # Another run materialized the same key first; its contents are identical.
+        shutil.rmtree(tmp, ignore_errors=True)
+    return target
+
+
+def load_variants(cache_dir: Path, key: str) -> Optional[pd.DataFrame]:
+    """Load a cached variant DataFrame, or return None on a cache miss.
+
+    The arrays are opened memory-mapped, but text and category columns are
+    decoded into Python strings up front, so load time still grows with the
+    size of the variant set; it only skips CSV parsing and regeneration.
+    """
+    return _read_entry(cache_dir / key)
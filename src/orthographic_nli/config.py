@@ -18,6 +18,7 @@ class Settings:
     groq_api_keys: List[str]
     results_dir: str
     write_traces: bool
+    variant_cache_dir: str
 
 
 def _parse_list(value: str) -> List[str]:
@@ -36,4 +37,5 @@ def load_settings() -> Settings:
         groq_api_keys=_parse_list(os.getenv("GROQ_API_KEYS", "")),
         results_dir=os.getenv("RESULTS_DIR", "./results"),
         write_traces=bool(int(os.getenv("WRITE_TRACES", "0"))),
+        variant_cache_dir=os.getenv("VARIANT_CACHE_DIR", "./cache/variants"),
     )
@@ -2,13 +2,14 @@ from __future__ import annotations
 
 import json
 import time
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
 import pandas as pd
 from sklearn.metrics import confusion_matrix, f1_score
 from tqdm.auto import tqdm
 
 from .groq_client import LABEL_ORDER, ModelSpec, build_key_cycle, run_model
+from .profiling import NULL_PROFILER, PhaseProfiler
 
 
 def evaluate(
@@ -18,6 +19,7 @@ def evaluate(
     requests_per_minute: int,
     max_examples_per_condition: int,
     rng_seed: int,
+    profiler: Optional[PhaseProfiler] = None,
 ) -> Tuple[pd.DataFrame, pd.DataFrame]:
     """Evaluate multiple models across all orthographic conditions.
     
@@ -28,12 +30,15 @@ def evaluate(
         requests_per_minute: Rate limit for API calls.
         max_examples_per_condition: Maximum examples to evaluate per condition.
         rng_seed: Random seed for reproducible sampling.
+        profiler: Optional profiler timing each model-language-condition cell
+            and the API calls, sleeps and metric computation inside it.
         
     Returns:
         Tuple of (results_df, predictions_df):
             - results_df: Accuracy, F1, and confusion matrix per model-language-condition.
             - predictions_df: Per-example predictions with metadata.
     """
+    profiler = profiler or NULL_PROFILER
     results = []
     predictions = []
     key_cycle = build_key_cycle(groq_keys)
@@ -47,24 +52,28 @@ def evaluate(
         for spec in specs:
             truths: List[str] = []
             preds: List[str] = []
-            for _, row in tqdm(subset.iterrows(), total=len(subset), desc=f"{spec.model} {lang} {cond}"):
-                pred = run_model(spec, row.premise, row.hypothesis, key_cycle)
-                preds.append(pred)
-                truths.append(row.label)
-                predictions.append({
-                    "provider": spec.provider,
-                    "model": spec.model,
-                    "language": lang,
-                    "condition": cond,
-                    "premise": row.premise,
-                    "hypothesis": row.hypothesis,
-                    "label": row.label,
-                    "prediction": pred,
-                })
-                time.sleep(sleep_between_calls)
-            acc = sum(p == t for p, t in zip(preds, truths)) / len(subset)
-            macro_f1 = f1_score(truths, preds, labels=LABEL_ORDER, average="macro", zero_division=0)
-            cm = confusion_matrix(truths, preds, labels=LABEL_ORDER)
+            with profiler.phase(f"evaluate/{spec.model}/{lang}/{cond}", items=len(subset)):
+                for _, row in tqdm(subset.iterrows(), total=len(subset), desc=f"{spec.model} {lang} {cond}"):
+                    with profiler.phase("evaluate/http", items=1):
+                        pred = run_model(spec, row.premise, row.hypothesis, key_cycle)
+                    preds.append(pred)
+                    truths.append(row.label)
+                    predictions.append({
+                        "provider": spec.provider,
+                        "model": spec.model,
+                        "language": lang,
+                        "condition": cond,
+                        "premise": row.premise,
+                        "hypothesis": row.hypothesis,
+                        "label": row.label,
+                        "prediction": pred,
+                    })
+                    with profiler.phase("evaluate/sleep"):
+                        time.sleep(sleep_between_calls)
+                with profiler.phase("evaluate/metrics", items=len(subset)):
+                    acc = sum(p == t for p, t in zip(preds, truths)) / len(subset)
+                    macro_f1 = f1_score(truths, preds, labels=LABEL_ORDER, average="macro", zero_division=0)
+                    cm = confusion_matrix(truths, preds, labels=LABEL_ORDER)
             results.append({
                 "provider": spec.provider,
                 "model": spec.model,
@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+import cProfile
+import io
+import json
+import pstats
+import re
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def _peak_rss_mb() -> Optional[float]:
+    """Return the process high-water resident set size in MiB, if available."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in KiB elsewhere.
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+@dataclass
+class PhaseStats:
+    name: str
+    calls: int = 0
+    wall_s: float = 0.0
+    cpu_s: float = 0.0
+    items: int = 0
+    traced_peak_mb: Optional[float] = None
+    process_peak_rss_mb: Optional[float] = None
+
+    @property
+    def items_per_s(self) -> Optional[float]:
+        if not self.items or self.wall_s <= 0:
+            return None
+        return self.items / self.wall_s
+
+    def to_dict(self) -> Dict:
+        return {
+            "name": self.name,
+            "calls": self.calls,
+            "wall_s": self.wall_s,
+            "cpu_s": self.cpu_s,
+            "items": self.items,
+            "items_per_s": self.items_per_s,
+            "traced_peak_mb": self.traced_peak_mb,
+            "process_peak_rss_mb": self.process_peak_rss_mb,
+        }
+
+
+class PhaseProfiler:
+    """Accumulate wall time, CPU time, memory and throughput per named phase.
+
+    Phases with the same name are aggregated, so a phase entered once per
+    API call reports the total across calls. ``process_peak_rss_mb`` is the
+    process-wide high-water mark when the phase last ended, so it never
+    decreases from one phase to the next. With ``trace_memory`` every phase
+    also records ``traced_peak_mb``, the peak traced Python heap while it
+    ran. When ``detail_phase`` is set, that phase additionally runs under
+    cProfile and tracemalloc, accumulated over all of its entries. Without
+    ``trace_memory``, tracemalloc only runs while the detail phase is open,
+    so other phases are timed without its overhead.
+
+    Args:
+        enabled: When False, ``phase`` is a no-op.
+        detail_phase: Name of the phase to run cProfile/tracemalloc on.
+        trace_memory: Record per-phase peaks with tracemalloc (slows the run).
+        top_n: Number of functions and allocation sites kept in the report.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        detail_phase: Optional[str] = None,
+        trace_memory: bool = False,
+        top_n: int = 25,
+    ) -> None:
+        self.enabled = enabled
+        self.detail_phase = detail_phase
+        self.trace_memory = trace_memory
+        self.top_n = top_n
+        self.phases: Dict[str, PhaseStats] = {}
+        self._cprofile: Optional[cProfile.Profile] = None
+        self._allocations: Dict[str, Dict] = {}
+        self._detail_start: Optional[tracemalloc.Snapshot] = None
+        self._owns_tracing = False
+        # Peak traced bytes seen so far by each open traced phase, innermost last.
+        self._open_peaks: List[int] = []
+
+    @contextmanager
+    def phase(self, name: str, items: int = 0) -> Iterator[None]:
+        """Time the enclosed block under ``name``, counting ``items`` processed."""
+        if not self.enabled:
+            yield
+            return
+        detail = name == self.detail_phase
+        traced = self.trace_memory or detail
+        if traced:
+            self._enter_traced()
+        if detail:
+            self._detail_start = self._snapshot()
+            self._cprofile = self._cprofile or cProfile.Profile()
+            self._cprofile.enable()
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall_start
+            cpu = time.process_time() - cpu_start
+            if detail:
+                self._cprofile.disable()
+                self._merge_allocations()
+            stats = self.phases.setdefault(name, PhaseStats(name))
+            if traced:
+                peak_mb = self._exit_traced() / (1024 * 1024)
+                stats.traced_peak_mb = max(stats.traced_peak_mb or 0.0, peak_mb)
+            stats.calls += 1
+            stats.wall_s += wall
+            stats.cpu_s += cpu
+            stats.items += items
+            stats.process_peak_rss_mb = _peak_rss_mb()
+
+    def count(self, name: str, items: int) -> None:
+        """Add ``items`` to a phase whose size is only known after it ran."""
+        if self.enabled:
+            self.phases.setdefault(name, PhaseStats(name)).items += items
+
+    def _enter_traced(self) -> None:
+        # tracemalloc has a single global peak, so hand the peak reached so far
+        # to the enclosing phase before resetting it for this one.
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._owns_tracing = True
+        if self._open_peaks:
+            self._open_peaks[-1] = max(self._open_peaks[-1], tracemalloc.get_traced_memory()[1])
+        tracemalloc.reset_peak()
+        self._open_peaks.append(0)
+
+    def _exit_traced(self) -> int:
+        peak = max(self._open_peaks.pop(), tracemalloc.get_traced_memory()[1])
+        tracemalloc.reset_peak()
+        if self._open_peaks:
+            self._open_peaks[-1] = max(self._open_peaks[-1], peak)
+        elif self._owns_tracing and not self.trace_memory:
+            tracemalloc.stop()
+            self._owns_tracing = False
+        return peak
+
+    @staticmethod
+    def _snapshot() -> tracemalloc.Snapshot:
+        # Exclude tracemalloc's own bookkeeping, e.g. the entry snapshot itself.
+        return tracemalloc.take_snapshot().filter_traces([tracemalloc.Filter(False, tracemalloc.__file__)])
+
+    def _merge_allocations(self) -> None:
+        """Keep the largest growth per allocation site across detail entries."""
+        for stat in self._snapshot().compare_to(self._detail_start, "lineno"):
+            if stat.size_diff <= 0:
+                continue
+            location = str(stat.traceback)
+            current = self._allocations.get(location)
+            if current is None or stat.size_diff > current["size"]:
+                self._allocations[location] = {"size": stat.size_diff, "count": stat.count_diff}
+        self._detail_start = None
+
+    def _detail_report(self) -> Optional[Dict]:
+        if self._cprofile is None:
+            return None
+        buffer = io.StringIO()
+        pstats.Stats(self._cprofile, stream=buffer).sort_stats("cumulative").print_stats(self.top_n)
+        largest = sorted(self._allocations.items(), key=lambda item: item[1]["size"], reverse=True)[: self.top_n]
+        allocations = [
+            {"location": location, "size_kb": stat["size"] / 1024, "count": stat["count"]}
+            for location, stat in largest
+        ]
+        return {
+            "phase": self.detail_phase,
+            "traced_peak_mb": self.phases[self.detail_phase].traced_peak_mb,
+            "top_functions": buffer.getvalue().splitlines(),
+            "top_allocations": allocations,
+        }
+
+    def missing_detail_phase(self) -> bool:
+        """True if ``detail_phase`` was requested but never entered."""
+        return self.enabled and self.detail_phase is not None and self.detail_phase not in self.phases
+
+    def report(self) -> Dict:
+        return {
+            "phases": [stats.to_dict() for stats in self.phases.values()],
+            "detail": self._detail_report(),
+        }
+
+    def write_report(self, results_dir: Path) -> Path:
+        """Write ``profile.json`` (and a ``.prof`` dump for the detail phase)."""
+        if self._cprofile is not None:
+            slug = re.sub(r"[^A-Za-z0-9_.-]+", "_", self.detail_phase)
+            self._cprofile.dump_stats(str(results_dir / f"profile_{slug}.prof"))
+        path = results_dir / "profile.json"
+        with open(path, "w", encoding="utf-8") as handle:
+            json.dump(self.report(), handle, indent=2)
+        return path
+
+    def format_table(self, limit: int = 15) -> str:
+        """Render the slowest phases by wall time as a plain-text table."""
+        rows = sorted(self.phases.values(), key=lambda s: s.wall_s, reverse=True)[:limit]
+        width = max([len("phase")] + [len(s.name) for s in rows])
+        lines = [f"{'phase':<{width}}  {'calls':>6}  {'wall_s':>9}  {'cpu_s':>9}  {'traced_mb':>9}  {'rss_mb':>8}  {'items/s':>9}"]
+        for s in rows:
+            traced = f"{s.traced_peak_mb:.1f}" if s.traced_peak_mb is not None else "-"
+            rss = f"{s.process_peak_rss_mb:.1f}" if s.process_peak_rss_mb is not None else "-"
+            rate = f"{s.items_per_s:.1f}" if s.items_per_s is not None else "-"
+            lines.append(f"{s.name:<{width}}  {s.calls:>6}  {s.wall_s:>9.3f}  {s.cpu_s:>9.3f}  {traced:>9}  {rss:>8}  {rate:>9}")
+        return "\n".join(lines)
+
+
+NULL_PROFILER = PhaseProfiler(enabled=False)
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import random
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .evaluate import evaluate
+from .groq_client import ModelSpec
+from .profiling import PhaseProfiler
+from .variants import check_ratios, condition_label, make_variants, mix_with_tokens, romanize_ratio
+
+
+def _perturb(
+    rows: pd.DataFrame,
+    condition: str,
+    transform: Callable[[str, random.Random], str],
+    rng: random.Random,
+) -> List[Dict]:
+    records: List[Dict] = []
+    for row in rows.itertuples(index=False):
+        records.append({
+            "premise": transform(row.premise, rng),
+            "hypothesis": transform(row.hypothesis, rng),
+            "label": row.label_text,
+            "language": row.language,
+            "condition": condition,
+        })
+    return records
+
+
+def sweep_variants(
+    df: pd.DataFrame,
+    en_tokens: Sequence[str],
+    ur_tokens: Sequence[str],
+    seeds: Sequence[int],
+    romanize_ratios: Sequence[float],
+    mix_ratios: Sequence[float],
+) -> pd.DataFrame:
+    """Generate variants for every seed of a ratio sweep.
+
+    Conditions that do not depend on the perturbation RNG (clean, diacritics,
+    Swahili control) are generated once with ``seed`` set to NaN so they are
+    only evaluated once. Ratio-controlled conditions (R*, M*) are generated
+    per seed, each from its own RNG seeded by (seed, language, condition), so
+    a sweep point's text does not depend on the rest of the grid. Zero ratios
+    are dropped because they reproduce the clean text.
+
+    Args:
+        df: Base DataFrame as returned by ``load_local_xnli``.
+        en_tokens: English donor token pool.
+        ur_tokens: Urdu donor token pool.
+        seeds: Perturbation seeds to sweep over.
+        romanize_ratios: Romanization ratios applied to Urdu.
+        mix_ratios: Code-switching ratios applied to Urdu, Swahili and English.
+
+    Returns:
+        Variant DataFrame with additional ``ratio`` and ``seed`` columns.
+
+    Raises:
+        ValueError: If a ratio is invalid (see ``check_ratios``) or a seed
+            repeats.
+    """
+    if len(set(seeds)) != len(seeds):
+        raise ValueError(f"Seeds must not repeat: {list(seeds)}")
+    romanize_ratios = [r for r in check_ratios("R", romanize_ratios) if r > 0]
+    mix_ratios = [r for r in check_ratios("M", mix_ratios) if r > 0]
+
+    # With no ratios make_variants emits only the seed-independent conditions.
+    shared = make_variants(df, en_tokens, ur_tokens, random.Random(0), romanize_ratios=(), mix_ratios=())
+    frames: List[pd.DataFrame] = [shared.assign(ratio=np.where(shared.condition == "clean", 0.0, np.nan), seed=np.nan)]
+
+    donors = {"ur": en_tokens, "sw": en_tokens, "en": ur_tokens}
+    for seed in seeds:
+        records: List[Dict] = []
+        for lang, rows in df.groupby("language", sort=False):
+            jobs: List[Tuple[str, float, Callable[[str, random.Random], str]]] = []
+            if lang == "ur":
+                jobs += [
+                    (condition_label("R", r), r, lambda text, rng, r=r: romanize_ratio(text, "ur", r, rng))
+                    for r in romanize_ratios
+                ]
+            if lang in donors:
+                jobs += [
+                    (condition_label("M", r), r, lambda text, rng, r=r, pool=donors[lang]: mix_with_tokens(text, pool, r, rng))
+                    for r in mix_ratios
+                ]
+            for condition, ratio, transform in jobs:
+                rng = random.Random(f"{seed}/{lang}/{condition}")
+                batch = _perturb(rows, condition, transform, rng)
+                records.extend({**record, "ratio": ratio, "seed": float(seed)} for record in batch)
+        frames.append(pd.DataFrame.from_records(records, columns=list(shared.columns) + ["ratio", "seed"]))
+    return pd.concat(frames, ignore_index=True)
+
+
+def run_sweep(
+    variants_df: pd.DataFrame,
+    specs: List[ModelSpec],
+    groq_keys: List[str],
+    requests_per_minute: int,
+    max_examples_per_condition: int,
+    rng_seed: int,
+    profiler: Optional[PhaseProfiler] = None,
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Evaluate a sweep produced by ``sweep_variants``.
+
+    Shared conditions are evaluated once and their metrics are repeated for
+    every seed, so each seed has a complete curve starting at the clean
+    baseline. Example sampling uses ``rng_seed`` for every sweep point, which
+    keeps the same underlying examples across ratios and seeds.
+
+    Args:
+        variants_df: Output of ``sweep_variants``.
+        specs: List of model specifications to evaluate.
+        groq_keys: API keys for Groq inference.
+        requests_per_minute: Rate limit for API calls.
+        max_examples_per_condition: Maximum examples to evaluate per condition.
+        rng_seed: Random seed for reproducible sampling.
+        profiler: Optional profiler passed through to ``evaluate``.
+
+    Returns:
+        Tuple of (results_df, predictions_df) with ``ratio`` and ``seed``
+        columns. results_df has one row per model-language-condition-seed.
+    """
+    ratios = variants_df.groupby("condition").ratio.first()
+    shared_mask = variants_df.seed.isna()
+    seeds = sorted(variants_df.loc[~shared_mask, "seed"].unique())
+
+    shared_results, shared_predictions = evaluate(
+        variants_df[shared_mask],
+        specs,
+        groq_keys,
+        requests_per_minute,
+        max_examples_per_condition,
+        rng_seed,
+        profiler,
+    )
+    results = [shared_results.assign(seed=seed) for seed in seeds] or [shared_results.assign(seed=np.nan)]
+    predictions = [shared_predictions.assign(seed=np.nan)]
+
+    for seed, subset in variants_df[~shared_mask].groupby("seed"):
+        seed_results, seed_predictions = evaluate(
+            subset,
+            specs,
+            groq_keys,
+            requests_per_minute,
+            max_examples_per_condition,
+            rng_seed,
+            profiler,
+        )
+        results.append(seed_results.assign(seed=seed))
+        predictions.append(seed_predictions.assign(seed=seed))
+
+    results_df = pd.concat(results, ignore_index=True)
+    predictions_df = pd.concat(predictions, ignore_index=True)
+    for frame in (results_df, predictions_df):
+        if not frame.empty:
+            frame["ratio"] = frame.condition.map(ratios)
+            frame["seed"] = frame.seed.astype("Int64")
+    if not results_df.empty:
+        results_df = results_df.sort_values(["provider", "model", "language", "seed", "ratio", "condition"], ignore_index=True)
+    return results_df, predictions_df
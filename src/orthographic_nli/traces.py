@@ -2,11 +2,12 @@ from __future__ import annotations
 
 import json
 import time
-from typing import List
+from typing import List, Optional
 
 import pandas as pd
 
 from .groq_client import ModelSpec, build_key_cycle, run_model
+from .profiling import NULL_PROFILER, PhaseProfiler
 
 
 def log_traces(
@@ -17,7 +18,9 @@ def log_traces(
     output_path: str,
     rng_seed: int,
     per_condition: int = 20,
+    profiler: Optional[PhaseProfiler] = None,
 ) -> None:
+    profiler = profiler or NULL_PROFILER
     key_cycle = build_key_cycle(groq_keys)
     sleep_between_calls = 60 / max(requests_per_minute, 1)
     with open(output_path, "w", encoding="utf-8") as handle:
@@ -25,17 +28,20 @@ def log_traces(
         for (lang, cond), subset in grouped:
             subset = subset.sample(min(per_condition, len(subset)), random_state=rng_seed)
             for spec in specs:
-                for _, row in subset.iterrows():
-                    pred = run_model(spec, row.premise, row.hypothesis, key_cycle)
-                    record = {
-                        "provider": spec.provider,
-                        "model": spec.model,
-                        "language": lang,
-                        "condition": cond,
-                        "label": row.label,
-                        "prediction": pred,
-                        "premise": row.premise,
-                        "hypothesis": row.hypothesis,
-                    }
-                    handle.write(json.dumps(record, ensure_ascii=False) + "\n")
-                    time.sleep(sleep_between_calls)
+                with profiler.phase(f"traces/{spec.model}/{lang}/{cond}", items=len(subset)):
+                    for _, row in subset.iterrows():
+                        with profiler.phase("traces/http", items=1):
+                            pred = run_model(spec, row.premise, row.hypothesis, key_cycle)
+                        record = {
+                            "provider": spec.provider,
+                            "model": spec.model,
+                            "language": lang,
+                            "condition": cond,
+                            "label": row.label,
+                            "prediction": pred,
+                            "premise": row.premise,
+                            "hypothesis": row.hypothesis,
+                        }
+                        handle.write(json.dumps(record, ensure_ascii=False) + "\n")
+                        with profiler.phase("traces/sleep"):
+                            time.sleep(sleep_between_calls)
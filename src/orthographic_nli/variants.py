@@ -2,12 +2,14 @@ from __future__ import annotations
 
 import random
 import unicodedata
-from typing import Dict, Iterable, List, Sequence
+from typing import Dict, Iterable, List, Sequence, Tuple
 
 import pandas as pd
 from tqdm.auto import tqdm
 
 ARABIC_DIACRITICS = tuple(chr(c) for c in range(0x064B, 0x0653))
+DEFAULT_ROMANIZE_RATIOS = (0.25, 0.5, 1.0)
+DEFAULT_MIX_RATIOS = (0.25, 0.5)
 
 URDU_ROMAN = {"ا": "a", "آ": "aa", "ب": "b", "پ": "p", "ت": "t", "ٹ": "t", "ث": "s", "ج": "j", "چ": "ch", "ح": "h", "خ": "kh", "د": "d", "ڈ": "d", "ذ": "z", "ر": "r", "ڑ": "r", "ز": "z", "ژ": "zh", "س": "s", "ش": "sh", "ص": "s", "ض": "z", "ط": "t", "ظ": "z", "ع": "a", "غ": "gh", "ف": "f", "ق": "q", "ک": "k", "گ": "g", "ل": "l", "م": "m", "ن": "n", "ں": "n", "و": "w", "ؤ": "o", "ہ": "h", "ء": "", "ی": "y", "ے": "e", "ۓ": "e"}
 PASHTO_ROMAN = {"ا": "a", "آ": "aa", "ب": "b", "پ": "p", "ت": "t", "ټ": "tt", "ث": "s", "ج": "j", "ځ": "dz", "چ": "ch", "ح": "h", "خ": "kh", "د": "d", "ډ": "dd", "ذ": "z", "ر": "r", "ړ": "rr", "ز": "z", "ژ": "zh", "ږ": "gh", "س": "s", "ش": "sh", "ښ": "x", "ص": "s", "ض": "z", "ط": "t", "ظ": "z", "ع": "a", "غ": "gh", "ف": "f", "ق": "q", "ک": "k", "ګ": "g", "گ": "g", "ل": "l", "م": "m", "ن": "n", "ڼ": "nn", "و": "w", "ؤ": "o", "ه": "h", "ۀ": "e", "ی": "y", "ې": "e", "ۍ": "ai"}
@@ -114,6 +116,40 @@ def mix_with_tokens(text: str, donor_tokens: Sequence[str], ratio: float, rng: r
     return " ".join(out)
 
 
+def condition_label(prefix: str, ratio: float) -> str:
+    """Name a ratio-controlled condition, e.g. ``("R", 0.25) -> "R25"``."""
+    return f"{prefix}{int(round(ratio * 100))}"
+
+
+def check_ratios(prefix: str, ratios: Sequence[float]) -> List[float]:
+    """Validate ratios so each maps to its own condition label.
+
+    Labels are whole percentages, so ratios must lie in [0, 1], be multiples
+    of 0.01 and not repeat.
+
+    Args:
+        prefix: Condition label prefix ("R" or "M").
+        ratios: Ratios to validate.
+
+    Returns:
+        The ratios as a list of floats.
+
+    Raises:
+        ValueError: If a ratio is out of range, finer than 1% or duplicated.
+    """
+    seen: Dict[str, float] = {}
+    for ratio in ratios:
+        if not 0.0 <= ratio <= 1.0:
+            raise ValueError(f"Ratio {ratio} is outside [0, 1]")
+        if abs(ratio * 100 - round(ratio * 100)) > 1e-6:
+            raise ValueError(f"Ratio {ratio} is not a whole percentage")
+        label = condition_label(prefix, ratio)
+        if label in seen:
+            raise ValueError(f"Ratios {seen[label]} and {ratio} both map to condition {label}")
+        seen[label] = ratio
+    return [float(ratio) for ratio in ratios]
+
+
 def build_token_pool(sentences: Iterable[str]) -> List[str]:
     tokens: List[str] = []
     for sent in sentences:
@@ -121,13 +157,29 @@ def build_token_pool(sentences: Iterable[str]) -> List[str]:
     return tokens
 
 
+def build_donor_pools(df: pd.DataFrame) -> Tuple[List[str], List[str]]:
+    """Build the English and Urdu donor token pools used for code-switching.
+
+    Args:
+        df: Base DataFrame as returned by ``load_local_xnli``.
+
+    Returns:
+        Tuple of (en_tokens, ur_tokens) drawn from premises and hypotheses.
+    """
+    en_rows = df[df.language == "en"]
+    ur_rows = df[df.language == "ur"]
+    en_tokens = build_token_pool(en_rows.premise.tolist() + en_rows.hypothesis.tolist())
+    ur_tokens = build_token_pool(ur_rows.premise.tolist() + ur_rows.hypothesis.tolist())
+    return en_tokens, ur_tokens
+
+
 def make_variants(
     df: pd.DataFrame,
     en_tokens: Sequence[str],
     ur_tokens: Sequence[str],
     rng: random.Random,
-    romanize_ratios: Sequence[float] = (0.25, 0.5, 1.0),
-    mix_ratios: Sequence[float] = (0.25, 0.5),
+    romanize_ratios: Sequence[float] = DEFAULT_ROMANIZE_RATIOS,
+    mix_ratios: Sequence[float] = DEFAULT_MIX_RATIOS,
 ) -> pd.DataFrame:
     records: List[Dict] = []
     for _, row in tqdm(df.iterrows(), total=len(df)):
@@ -153,7 +205,7 @@ def make_variants(
             })
         if row.language == "ur":
             for ratio in romanize_ratios:
-                label = f"R{int(ratio * 100)}"
+                label = condition_label("R", ratio)
                 records.append({
                     **base,
                     "premise": romanize_ratio(row.premise, "ur", ratio, rng),
@@ -161,7 +213,7 @@ def make_variants(
                     "condition": label,
                 })
             for ratio in mix_ratios:
-                label = f"M{int(ratio * 100)}"
+                label = condition_label("M", ratio)
                 records.append({
                     **base,
                     "premise": mix_with_tokens(row.premise, en_tokens, ratio, rng),
@@ -171,7 +223,7 @@ def make_variants(
         if row.language == "sw":
             records.append({**base, "condition": "romanized"})
             for ratio in mix_ratios:
-                label = f"M{int(ratio * 100)}"
+                label = condition_label("M", ratio)
                 records.append({
                     **base,
                     "premise": mix_with_tokens(row.premise, en_tokens, ratio, rng),
@@ -180,7 +232,7 @@ def make_variants(
                 })
         if row.language == "en":
             for ratio in mix_ratios:
-                label = f"M{int(ratio * 100)}"
+                label = condition_label("M", ratio)
                 records.append({
                     **base,
                     "premise": mix_with_tokens(row.premise, ur_tokens, ratio, rng),